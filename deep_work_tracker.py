@@ -2,12 +2,32 @@
 
 import json
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
+from itertools import islice
 import os
 
+import dwt_json
+
+try:
+    # Optional streaming JSON parser for very large histories
+    import ijson
+except ImportError:
+    ijson = None
+
 # Configuration file
 CONFIG_FILE = os.path.expanduser("~/.dwt_config.json")
+# Session data file
+DATA_FILE = 'deep-work-data.json'
+# Log of sessions appended since the data file was last compacted
+LOG_FILE = 'deep-work-data.jsonl'
+# Cache of aggregated daily hours
+CACHE_FILE = os.path.expanduser("~/.dwt_cache.json")
+# Read buffer size, so large data files are read in few syscalls
+READ_BUFFER_SIZE = 1 << 20
+# Data files larger than this are stream-parsed when ijson is available
+STREAM_THRESHOLD = 5_000_000
 
 # ANSI color codes
 class Colors:
@@ -20,68 +40,207 @@ class Colors:
     CYAN = '\033[96m'
     GRAY = '\033[90m'
 
+# 256-color palette progression, indexed by whole hours worked (capped at 4)
+INTENSITY_COLORS = (
+    '\033[38;5;49m',   # Color 49 (under 1h)
+    '\033[38;5;49m',   # Color 49 (1h)
+    '\033[38;5;47m',   # Color 47 (2h)
+    '\033[38;5;40m',   # Color 40 (3h)
+    '\033[38;5;28m',   # Color 28 (4h or more - highest intensity)
+)
+
+# Pre-rendered contribution graph cells
+EMPTY_CELL = f"{Colors.GRAY}··{Colors.RESET}"
+INTENSITY_CELLS = tuple(f"{color}██{Colors.RESET}" for color in INTENSITY_COLORS)
+
+# Progress bar segments, sliced to length instead of rebuilt for every bar
+BAR_FULL = '█' * 64
+BAR_EMPTY = '░' * 64
+
+@lru_cache(maxsize=4)
+def _load_json_cached(path, mtime_ns):
+    """Parse a JSON file, reusing the result until its mtime changes"""
+    with open(path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        return dwt_json.loads(f.read())
+
+def load_json(path):
+    """Load a JSON file through the in-process cache (treat the result as read-only)"""
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
 def load_config():
     """Load configuration from file"""
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            pass
-    # Default configuration
-    return {"daily_goal": 4.0}
+    try:
+        return load_json(CONFIG_FILE)
+    except (OSError, ValueError):
+        # Default configuration
+        return {"daily_goal": 4.0}
 
 def load_data():
     """Load the deep work data from JSON file, auto-create if missing"""
     try:
-        with open('deep-work-data.json', 'r') as f:
-            return json.load(f)
+        return load_json(DATA_FILE)
     except FileNotFoundError:
         # Auto-create empty file
         empty_data = {"sessions": []}
-        with open('deep-work-data.json', 'w') as f:
-            json.dump(empty_data, f, indent=2)
+        with open(DATA_FILE, 'wb') as f:
+            f.write(dwt_json.dumps(empty_data, indent=2))
         print(f"{Colors.YELLOW}No deep-work-data.json found. Created a new one for you!{Colors.RESET}")
         return empty_data
     except json.JSONDecodeError:
         print(f"{Colors.RED}Error: Invalid JSON in deep-work-data.json{Colors.RESET}")
         sys.exit(1)
 
+def load_log():
+    """Load the sessions appended to the session log since the last compaction"""
+    try:
+        with open(LOG_FILE, 'rb') as f:
+            lines = f.read().split(b'\n')
+    except FileNotFoundError:
+        return []
+    # Only newline-terminated records are complete; skip any torn record
+    # that a later append was glued onto
+    sessions = []
+    for line in lines[:-1]:
+        if line:
+            try:
+                sessions.append(dwt_json.loads(line))
+            except ValueError:
+                pass
+    return sessions
+
+def iter_data_sessions():
+    """Iterate over the data file's sessions, streaming large data files"""
+    if ijson is None or os.path.getsize(DATA_FILE) <= STREAM_THRESHOLD:
+        yield from load_data()['sessions']
+    else:
+        with open(DATA_FILE, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            try:
+                yield from ijson.items(f, 'sessions.item', use_float=True)
+            except ijson.JSONError:
+                print(f"{Colors.RED}Error: Invalid JSON in deep-work-data.json{Colors.RESET}")
+                sys.exit(1)
+
+def iter_sessions(log):
+    """Iterate over all sessions, the data file's then the log's"""
+    data_ids = set()
+    for session in iter_data_sessions():
+        data_ids.add(session.get('id'))
+        yield session
+    
+    # Sessions logged since the last compaction come after the data file's. A
+    # compaction interrupted before removing the log leaves them in both
+    for session in log:
+        if session.get('id') not in data_ids:
+            yield session
+
+def track_sessions(sessions, seen):
+    """Pass sessions through, recording how many were seen and the last id"""
+    for session in sessions:
+        seen['count'] += 1
+        seen['last_session_id'] = session.get('id')
+        yield session
+
+@lru_cache(maxsize=None)
+def iso_date_ordinal(day):
+    """Convert a YYYY-MM-DD string to a date ordinal"""
+    return date.fromisoformat(day).toordinal()
+
 def process_sessions(data):
-    """Process sessions and group by date"""
-    daily_hours = defaultdict(float)
+    """Process sessions and group by date ordinal"""
+    daily_minutes = defaultdict(float)
     
     for session in data['sessions']:
         if session['completed'] and session['duration'] > 0:
-            # Parse the start date
-            start_time = datetime.fromisoformat(session['startTime'].replace('Z', '+00:00'))
-            date_key = start_time.date()
-            
-            # Convert duration from minutes to hours
-            hours = session['duration'] / 60.0
-            daily_hours[date_key] += hours
+            # ISO timestamps start with the YYYY-MM-DD date we group by
+            daily_minutes[session['startTime'][:10]] += session['duration']
     
-    return daily_hours
+    # Parse each distinct day once and convert duration from minutes to hours
+    return {iso_date_ordinal(day): minutes / 60.0 for day, minutes in daily_minutes.items()}
 
-def get_intensity_char(hours, goal=4.0):
-    """Get the character representation based on hours worked"""
-    if hours == 0:
-        return '·'
-    else:
-        return '█'  # Use solid square for all activity levels, color will show intensity
+def load_cache():
+    """Load the daily hours cache from file"""
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            return dwt_json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
 
-def get_intensity_color(hours, goal=4.0):
-    """Get the color based on hours worked - 256-color palette progression"""
-    if hours == 0:
-        return '\033[90m'        # Gray dot (no activity)
-    elif hours < 2:
-        return '\033[38;5;49m'   # Color 49 (1h)
-    elif hours < 3:
-        return '\033[38;5;47m'   # Color 47 (2h)
-    elif hours < 4:
-        return '\033[38;5;40m'   # Color 40 (3h)
+def save_cache(cache):
+    """Atomically save the daily hours cache to file"""
+    tmp_file = CACHE_FILE + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(dwt_json.dumps(cache))
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError:
+        pass  # The cache is only an optimization
+
+def get_data_fingerprint():
+    """Get the (mtime_ns, size) of the data file and the session log"""
+    fingerprint = []
+    for path in (DATA_FILE, LOG_FILE):
+        try:
+            stat = os.stat(path)
+            fingerprint += [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            fingerprint += [None, None]
+    return fingerprint
+
+def get_daily_hours():
+    """Get hours per date ordinal, only aggregating sessions added since the last run"""
+    if not os.path.exists(DATA_FILE):
+        load_data()  # Auto-create the data file
+    
+    data_path = os.path.abspath(DATA_FILE)
+    fingerprint = get_data_fingerprint()
+    cache = load_cache()
+    if cache.get('data_file') != data_path:
+        cache = {}
+    daily_hours = {iso_date_ordinal(day): hours for day, hours in cache.get('daily_hours', {}).items()}
+    
+    # Data file and log untouched since the cache was written
+    if cache.get('fingerprint') == fingerprint:
+        return daily_hours
+    
+    log = load_log()
+    count = cache.get('session_count', 0)
+    log_count = cache.get('log_count')
+    if (cache.get('fingerprint', [])[:2] == fingerprint[:2]
+            and log_count is not None and log_count <= len(log)
+            and (log_count == 0 or log[log_count - 1].get('id') == cache.get('last_log_id'))):
+        # Only the log changed: aggregate its new records without reading the data file
+        seen = {'count': count, 'last_session_id': cache.get('last_session_id')}
+        sessions = log[log_count:]
     else:
-        return '\033[38;5;28m'   # Color 28 (4h or more - highest intensity)
+        sessions = iter_sessions(log)
+        last_cached = next(islice(sessions, count - 1, None), None) if count else None
+        if last_cached is not None and last_cached.get('id') == cache.get('last_session_id'):
+            # Sessions are only ever appended, so just aggregate the new tail
+            seen = {'count': count, 'last_session_id': last_cached.get('id')}
+        else:
+            daily_hours = {}
+            seen = {'count': 0, 'last_session_id': None}
+            sessions = iter_sessions(log)
+    
+    for day, hours in process_sessions({'sessions': track_sessions(sessions, seen)}).items():
+        daily_hours[day] = daily_hours.get(day, 0) + hours
+    
+    save_cache({
+        'data_file': data_path,
+        'fingerprint': fingerprint,
+        'session_count': seen['count'],
+        # Log records read, so a log-only change can skip the data file
+        'log_count': len(log),
+        'last_log_id': log[-1].get('id') if log else None,
+        'last_session_id': seen['last_session_id'],
+        'daily_hours': {date.fromordinal(day).isoformat(): hours for day, hours in daily_hours.items()}
+    })
+    return daily_hours
+
+def get_hours_by_day(daily_hours, start_date, num_days):
+    """Get a list of hours worked per day, indexed by day offset from start_date"""
+    start = start_date.toordinal()
+    return [daily_hours.get(day, 0) for day in range(start, start + num_days)]
 
 def create_contribution_graph(daily_hours, daily_goal=4.0, weeks=26):
     """Create a GitHub-like contribution graph"""
@@ -92,12 +251,12 @@ def create_contribution_graph(daily_hours, daily_goal=4.0, weeks=26):
     days_since_monday = start_date.weekday()
     graph_start = start_date - timedelta(days=days_since_monday)
     
-    print(f"\n{Colors.BOLD}Contribution Graph (Last 6 months){Colors.RESET}")
-    print("─" * 80)
+    # Build the whole graph in memory and write it out once
+    out = [f"\n{Colors.BOLD}Contribution Graph (Last 6 months){Colors.RESET}\n", "─" * 80, "\n"]
     
     # Day labels
     days = ['Mon', 'Wed', 'Fri']
-    print("     ", end="")
+    out.append("     ")
     
     # Month labels - create proper month headers spanning correct number of weeks
     month_spans = []
@@ -119,86 +278,54 @@ def create_contribution_graph(daily_hours, daily_goal=4.0, weeks=26):
     if current_month is not None:
         month_spans.append((current_month, month_start_week, weeks - 1))
     
-    # Print month headers with proper spacing
-    week_pos = 0
-    for month_name, start_week, end_week in month_spans:
-        # Add padding for weeks before this month
-        while week_pos < start_week:
-            print("  ", end="")  # 2 chars for the week
-            if week_pos < weeks - 1:  # space between weeks
-                print(" ", end="")
-            week_pos += 1
-        
-        # Calculate month span and center the month name (2 chars per week + spaces between)
-        num_weeks = end_week - start_week + 1
-        month_width = num_weeks * 2 + (num_weeks - 1)  # 2 chars per week + spaces between weeks
-        month_label = month_name.center(month_width)
-        print(month_label, end="")
-        week_pos = end_week + 1
-    
-    # Add remaining padding
-    while week_pos < weeks:
-        print("  ", end="")  # 2 chars for the week
-        if week_pos < weeks - 1:  # space between weeks
-            print(" ", end="")
-        week_pos += 1
-    
-    print()
+    # Month headers, each centered over its weeks (3 columns per week: 2 chars + 1 space)
+    out.append(" ".join(month_name.center((end_week - start_week + 1) * 3 - 1)
+                        for month_name, start_week, end_week in month_spans))
+    out.append("\n")
+    
+    # Hours per cell, indexed by days since graph_start; days after today stay empty
+    num_days = weeks * 7
+    past_days = max(0, min(num_days, (today - graph_start).days + 1))
+    hours_by_day = get_hours_by_day(daily_hours, graph_start, past_days) + [0] * (num_days - past_days)
     
     # Graph rows
     for day_idx in range(7):  # Monday to Sunday
         if day_idx % 2 == 0 and day_idx//2 < len(days):  # Show label only for Mon, Wed, Fri
-            print(f"{days[day_idx//2]:>3}  ", end="")
+            out.append(f"{days[day_idx//2]:>3}  ")
         else:
-            print("     ", end="")
+            out.append("     ")
         
-        for week in range(weeks):
-            current_date = graph_start + timedelta(weeks=week, days=day_idx)
-            
-            if current_date > today:
-                print(f"{Colors.GRAY}··{Colors.RESET}", end="")
-            else:
-                hours = daily_hours.get(current_date, 0)
-                # Use 4-hour goal for weekdays, 2-hour for weekends
-                is_weekday = current_date.weekday() < 5
-                goal = 4.0 if is_weekday else 2.0
-                char = get_intensity_char(hours, goal)
-                color = get_intensity_color(hours, goal)
-                print(f"{color}{char}{char}{Colors.RESET}", end="")
-            
-            # Add space between weeks (except for the last week)
-            if week < weeks - 1:
-                print(" ", end="")
+        # This weekday's cell in every week; days without activity are gray dots
+        cells = [INTENSITY_CELLS[min(int(hours), 4)] if hours else EMPTY_CELL
+                 for hours in hours_by_day[day_idx::7]]
         
-        print()  # New line after each day row
+        # Space between weeks, new line after each day row
+        out.append(" ".join(cells))
+        out.append("\n")
     
     # Legend with 256-color progression
-    print(f"\n     Less \033[38;5;49m█{Colors.RESET} \033[38;5;47m█{Colors.RESET} \033[38;5;40m█{Colors.RESET} \033[38;5;28m█{Colors.RESET} More")
+    out.append(f"\n     Less \033[38;5;49m█{Colors.RESET} \033[38;5;47m█{Colors.RESET} \033[38;5;40m█{Colors.RESET} \033[38;5;28m█{Colors.RESET} More\n")
     if daily_goal == 0:
-      print(f"     Goal: 🏖️ Vacation mode (no weekly goal)")
+      out.append(f"     Goal: 🏖️ Vacation mode (no weekly goal)\n")
     else:
-      print(f"     Goal: {daily_goal * 5:.0f} hours/week (weekdays)")
+      out.append(f"     Goal: {daily_goal * 5:.0f} hours/week (weekdays)\n")
+    
+    sys.stdout.write("".join(out))
 
 def calculate_weekly_deficit(daily_hours, current_week_start, daily_goal=4.0):
     """Calculate the deficit from previous weeks"""
     weekly_goal = daily_goal * 5  # daily_goal × 5 weekdays
     total_deficit = 0
     
-    # Check the last 8 weeks (including current week)
-    for week_offset in range(1, 9):  # Start from 1 to skip current week
-        week_start = current_week_start - timedelta(weeks=week_offset)
-        week_hours = 0
-        
+    # The 8 weeks before the current one, laid out Monday to Sunday
+    hours_by_day = get_hours_by_day(daily_hours, current_week_start - timedelta(weeks=8), 8 * 7)
+    
+    for week_offset in range(0, 8 * 7, 7):
         # Calculate hours for this week (weekdays only)
-        for day_offset in range(5):  # Monday to Friday
-            day = week_start + timedelta(days=day_offset)
-            if day in daily_hours:
-                week_hours += daily_hours[day]
+        week_hours = sum(hours_by_day[week_offset:week_offset + 5])
         
         # Add deficit if week didn't meet goal
-        if week_hours < weekly_goal:
-            week_deficit = weekly_goal - week_hours
-            total_deficit += week_deficit
+        total_deficit += max(0, weekly_goal - week_hours)
 
     return total_deficit
 
@@ -213,16 +340,16 @@ def create_weekly_progress(daily_hours, daily_goal=4.0):
     # Calculate deficit from previous weeks
     weekly_deficit = calculate_weekly_deficit(daily_hours, week_start, daily_goal)
     
-    print(f"\n{Colors.BOLD}This Week's Progress{Colors.RESET}")
-    print("─" * 50)
+    out = [f"\n{Colors.BOLD}This Week's Progress{Colors.RESET}\n", "─" * 50, "\n"]
     
     total_week_hours = 0
     weekday_hours = 0
+    extra_hours_this_week = 0  # Hours worked beyond daily goals
     
     for i in range(7):
         current_date = week_start + timedelta(days=i)
         day_name = current_date.strftime('%a')
-        hours = daily_hours.get(current_date, 0)
+        hours = daily_hours.get(current_date.toordinal(), 0)
         total_week_hours += hours
         
         # Check if it's a weekday (Monday=0, Sunday=6)
@@ -252,28 +379,16 @@ def create_weekly_progress(daily_hours, daily_goal=4.0):
         empty_length = bar_length - base_filled - overflow_filled
         
         # Choose color based on progress - 256-color progression
-        if not is_weekday and hours == 0:
-            bar_color = '\033[90m'         # Dark gray
-        elif not is_weekday and hours > 0:
-            bar_color = '\033[38;5;28m'    # Highest intensity green for weekend work
-        elif hours == 0:
-            bar_color = '\033[90m'         # Dark gray
-        elif hours >= 4:
-            bar_color = '\033[38;5;28m'    # Color 28 (4h or more - highest intensity)
-        elif hours >= 3:
-            bar_color = '\033[38;5;40m'    # Color 40 (3h)
-        elif hours >= 2:
-            bar_color = '\033[38;5;47m'    # Color 47 (2h)
-        elif hours > 0:
-            bar_color = '\033[38;5;49m'    # Color 49 (1h)
+        if hours == 0:
+            bar_color = Colors.GRAY          # Dark gray
+        elif not is_weekday:
+            bar_color = INTENSITY_COLORS[4]  # Highest intensity green for weekend work
         else:
-            bar_color = '\033[90m'         # Dark gray
+            bar_color = INTENSITY_COLORS[min(int(hours), 4)]
         
         # Create bar with overflow indication
-        if overflow_filled > 0:
-            bar = bar_color + '█' * base_filled + '\033[96m' + '█' * overflow_filled + Colors.RESET + '░' * empty_length
-        else:
-            bar = bar_color + '█' * base_filled + Colors.RESET + '░' * empty_length
+        overflow = f"{Colors.CYAN}{BAR_FULL[:overflow_filled]}" if overflow_filled > 0 else ""
+        bar = f"{bar_color}{BAR_FULL[:base_filled]}{overflow}{Colors.RESET}{BAR_EMPTY[:empty_length]}"
         
         # Mark today
         today_marker = " ← Today" if current_date == today else ""
@@ -282,19 +397,12 @@ def create_weekly_progress(daily_hours, daily_goal=4.0):
         deficit_indicator = ""
         if is_weekday and daily_goal > 0 and hours > daily_goal:
             extra = hours - daily_goal
+            extra_hours_this_week += extra
             deficit_indicator = f" (+{extra:.1f}h → deficit)"
         
-        print(f"{day_name} {current_date.strftime('%m/%d')} │{bar}│ {hours:4.1f}h / {goal_text}{deficit_indicator}{today_marker}")
+        out.append(f"{day_name} {current_date.strftime('%m/%d')} │{bar}│ {hours:4.1f}h / {goal_text}{deficit_indicator}{today_marker}\n")
     
-    # Calculate extra hours worked this week (beyond daily goals)
-    extra_hours_this_week = 0
-    for i in range(7):
-        current_date = week_start + timedelta(days=i)
-        is_weekday = i < 5  # Monday to Friday
-        if is_weekday and daily_goal > 0:
-            hours = daily_hours.get(current_date, 0)
-            if hours > daily_goal:
-                extra_hours_this_week += (hours - daily_goal)
+    sys.stdout.write("".join(out))
     
     # Weekly summary
     base_week_goal = daily_goal * 5  # daily_goal × 5 weekdays
@@ -340,24 +448,17 @@ def show_stats(daily_hours):
     
     # Calculate yearly sessions and averages
     today = datetime.now().date()
-    current_year = today.year
+    year_start = date(today.year, 1, 1)
+    
+    # Hours per day through today, covering both this year and the last 30 days
+    window_start = min(year_start, today - timedelta(days=29))
+    hours_by_day = get_hours_by_day(daily_hours, window_start, (today - window_start).days + 1)
     
     # Calculate total sessions in current year
-    year_sessions = 0
-    for date, hours in daily_hours.items():
-        if date.year == current_year and hours > 0:
-            year_sessions += 1
+    year_sessions = sum(1 for hours in hours_by_day[(year_start - window_start).days:] if hours > 0)
     
     # Last 30 days average
-    last_30_total = 0
-    last_30_days = 0
-    for i in range(30):
-        check_date = today - timedelta(days=i)
-        if check_date in daily_hours:
-            last_30_total += daily_hours[check_date]
-            last_30_days += 1
-    
-    avg_30_days = last_30_total / 30 if last_30_days > 0 else 0
+    avg_30_days = sum(hours_by_day[-30:]) / 30
     
     print(f"\n{Colors.BOLD}{Colors.BLUE}Statistics{Colors.RESET}")
     print("─" * 30)
@@ -371,8 +472,7 @@ def main():
     # Load configuration and data
     config = load_config()
     daily_goal = config.get('daily_goal', 4.0)
-    data = load_data()
-    daily_hours = process_sessions(data)
+    daily_hours = get_daily_hours()
     
     # Display visualizations
     create_contribution_graph(daily_hours, daily_goal)
@@ -0,0 +1,22 @@
+"""JSON helpers shared by the tracker and the timer, using orjson when installed"""
+
+import json
+
+try:
+    # Optional, much faster JSON parser and serializer
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=None):
+    """Serialize to JSON bytes, compact unless indent is given (orjson only indents by 2)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    separators = None if indent else (',', ':')
+    return json.dumps(obj, indent=indent, separators=separators).encode()
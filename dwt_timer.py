@@ -4,73 +4,145 @@ import json
 import time
 import sys
 import os
+import shutil
 import signal
 import subprocess
-import uuid
 import select
 import termios
 import tty
 from datetime import datetime, timedelta
+from enum import Enum
+from functools import cached_property
 from pathlib import Path
 
+import dwt_json
+
 # Timer state file
-STATE_FILE = os.path.expanduser("~/.dwt_session_state.json")
+STATE_FILE = Path.home() / ".dwt_session_state.json"
 # Configuration file
-CONFIG_FILE = os.path.expanduser("~/.dwt_config.json")
+CONFIG_FILE = Path.home() / ".dwt_config.json"
+# Configuration used when the config file is missing or unreadable
+DEFAULT_CONFIG = {"daily_goal": 4.0}
+# Session data files, kept next to this script
+SCRIPT_DIR = Path(__file__).absolute().parent
+DATA_FILE = SCRIPT_DIR / 'deep-work-data.json'
+LOG_FILE = SCRIPT_DIR / 'deep-work-data.jsonl'
+META_FILE = SCRIPT_DIR / 'deep-work-data.meta.json'
+# Session log size at which it is merged into the data file
+COMPACT_THRESHOLD = 64 * 1024
+# Timestamp format of the session log and data file
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+# Countdown progress bar width, and every bar it can show (pre-encoded)
+BAR_LENGTH = 30
+PROGRESS_BARS = tuple(('█' * i + '░' * (BAR_LENGTH - i)).encode() for i in range(BAR_LENGTH + 1))
+# One countdown line: remaining minutes, seconds and progress bar
+FRAME_FORMAT = "\r⏱️  %02d:%02d │%s│ [s]top [q]uit: ".encode()
+# Messages replacing the countdown line when it ends or is paused with 's'
+DONE_MESSAGE = "\r\033[KGreat job!\n\n".encode()
+PAUSED_MESSAGE = "\r\033[K⏸️  Session paused.\n\r\033[K\n".encode()
+
+def _atomic_write_json(path, obj, indent=None):
+    """Write JSON through a fsynced temp file so a crash never leaves a partial file"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(dwt_json.dumps(obj, indent))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _append_line(path, payload):
+    """Append one record with an O_APPEND write, fsynced"""
+    fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        # Terminate a fragment left by an earlier failed append, so it can't
+        # swallow this record
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b'\n':
+            payload = b'\n' + payload
+        # Finish a short write (disk full, quota, signal) instead of dropping the rest
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_dir(path):
+    """Flush a directory entry change (rename, unlink) to disk"""
+    fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class Action(Enum):
+    """How a countdown ended"""
+    COMPLETED = "completed"
+    ENDED = "ended"
+    PAUSED = "paused"
 
 class DeepWorkTimer:
-    def __init__(self):
-        self.state = self.load_state()
-        self.config = self.load_config()
+    # State and config are only read from disk when a command first uses them
+    @cached_property
+    def state(self):
+        return self.load_state()
+    
+    @cached_property
+    def config(self):
+        return self.load_config()
+    
+    # Helper binaries, resolved on $PATH once per process (None if missing)
+    @cached_property
+    def shortcuts_bin(self):
+        return shutil.which('shortcuts')
+    
+    @cached_property
+    def afplay_bin(self):
+        return shutil.which('afplay')
+    
+    @cached_property
+    def say_bin(self):
+        return shutil.which('say')
     
     def load_state(self):
         """Load timer state from file"""
-        if os.path.exists(STATE_FILE):
-            try:
-                with open(STATE_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {}
-    
-    def save_state(self, state):
-        """Save timer state to file"""
         try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
+            return dwt_json.loads(STATE_FILE.read_bytes())
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self, state=None):
+        """Save timer state to file (self.state, updated in place, unless a new state is given)"""
+        if state is not None:
             self.state = state
-        except Exception as e:
+        try:
+            _atomic_write_json(STATE_FILE, self.state)
+        except OSError as e:
             print(f"Error saving state: {e}")
     
     def clear_state(self):
         """Clear timer state"""
-        if os.path.exists(STATE_FILE):
-            os.remove(STATE_FILE)
+        STATE_FILE.unlink(missing_ok=True)
         self.state = {}
     
     def load_config(self):
         """Load configuration from file"""
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        # Default configuration
-        return {"daily_goal": 4.0}
+        try:
+            return dwt_json.loads(CONFIG_FILE.read_bytes())
+        except (OSError, ValueError):
+            return dict(DEFAULT_CONFIG)
     
     def save_config(self, config):
         """Save configuration to file"""
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+            _atomic_write_json(CONFIG_FILE, config, indent=2)
             self.config = config
-        except Exception as e:
+        except OSError as e:
             print(f"Error saving config: {e}")
     
     def set_daily_goal(self):
         """Set the daily goal interactively"""
-        current_goal = self.config.get('daily_goal', 4.0)
+        current_goal = self.config.get('daily_goal', DEFAULT_CONFIG['daily_goal'])
         print(f"\n⚙️  Current daily goal: {current_goal} hours")
         print("💡 Tip: Set to 0 for vacation days, or lower for light days")
         
@@ -100,11 +172,21 @@ class DeepWorkTimer:
         except KeyboardInterrupt:
             print("\n❌ Goal change cancelled.")
     
-    def run_shortcut(self, name):
-        """Run a macOS shortcut"""
+    def run_shortcut(self, name, wait=True):
+        """Run a macOS shortcut, or launch it in the background when wait is False"""
+        if self.shortcuts_bin is None:
+            print(f"❌ 'shortcuts' command not found. Make sure you're on macOS 12+ with Shortcuts app")
+            return False
         try:
-            result = subprocess.run(['shortcuts', 'run', name], 
-                                  capture_output=True, text=True, timeout=10)
+            if not wait:
+                # Fire and forget: nothing depends on the result
+                subprocess.Popen([self.shortcuts_bin, 'run', name], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
+                return True
+
+            # Only stderr is read, for the error message
+            result = subprocess.run([self.shortcuts_bin, 'run', name], stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, text=True, timeout=10)
             if result.returncode == 0:
                 return True
             else:
@@ -116,163 +198,272 @@ class DeepWorkTimer:
         except FileNotFoundError:
             print(f"❌ 'shortcuts' command not found. Make sure you're on macOS 12+ with Shortcuts app")
             return False
-        except Exception as e:
+        except OSError as e:
             print(f"❌ Error running shortcut: {e}")
             return False
     
     def play_notification_sound(self):
-        """Play a notification sound on macOS"""
+        """Play a notification sound on macOS without waiting for it to finish"""
         try:
-            # Play system notification sound
-            subprocess.run(['afplay', '/System/Library/Sounds/Glass.aiff'], 
-                         capture_output=True, timeout=5)
-        except:
-            try:
+            if self.afplay_bin:
+                # Play system notification sound
+                subprocess.Popen([self.afplay_bin, '/System/Library/Sounds/Glass.aiff'],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+                return
+            if self.say_bin:
                 # Fallback: use say command
-                subprocess.run(['say', 'Deep work session complete'], 
-                             capture_output=True, timeout=5)
-            except:
-                # Fallback: system beep
-                print('\a')  # ASCII bell character
+                subprocess.Popen([self.say_bin, 'Deep work session complete'],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                 start_new_session=True)
+                return
+        except OSError:
+            pass
+        # Fallback: system beep
+        print('\a')  # ASCII bell character
     
     def add_session_to_data(self, start_time, end_time, duration_minutes):
-        """Add a completed session to the deep work data file"""
-        # Get the script directory to find the data file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        data_file = os.path.join(script_dir, 'deep-work-data.json')
+        """Append a completed session to the deep work session log"""
+        # Create new session entry
+        new_session = {
+            # Sessions are logged one at a time, so the clock is a unique enough id
+            "id": str(time.time_ns()),
+            "startTime": start_time.strftime(TIMESTAMP_FORMAT),
+            "endTime": end_time.strftime(TIMESTAMP_FORMAT),
+            "duration": duration_minutes,
+            "completed": True
+        }
+        
+        # Append it as a single line instead of rewriting the whole history
+        try:
+            _append_line(LOG_FILE, dwt_json.dumps(new_session) + b'\n')
+            
+            print(f"\r\033[K📝 Session logged: {duration_minutes} minutes")
+            
+        except OSError as e:
+            print(f"❌ Error saving session data: {e}")
+            return False
         
+        self.update_meta(1)
+        
+        # Fold the log into the data file once it has grown. The session is
+        # already logged, so a failure here must not fail the session commit
+        try:
+            if LOG_FILE.stat().st_size >= COMPACT_THRESHOLD:
+                self.compact_data()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Error compacting session data: {e}")
+        return True
+    
+    def compact_data(self):
+        """Merge the session log into the deep work data file"""
         # Load existing data
         try:
-            with open(data_file, 'r') as f:
-                data = json.load(f)
+            data = dwt_json.loads(DATA_FILE.read_bytes())
         except FileNotFoundError:
-            print(f"❌ {data_file} not found. Cannot log session.")
-            return False
+            data = {"sessions": []}
         except json.JSONDecodeError:
-            print(f"❌ Invalid JSON in {data_file}. Cannot log session.")
+            print(f"❌ Invalid JSON in {DATA_FILE}. Cannot compact session log.")
             return False
         
-        # Create new session entry
-        new_session = {
-            "id": str(uuid.uuid4()),
-            "startTime": start_time.isoformat() + "Z",
-            "endTime": end_time.isoformat() + "Z",
-            "duration": duration_minutes,
-            "completed": True
-        }
+        try:
+            lines = LOG_FILE.read_bytes().split(b'\n')
+        except FileNotFoundError:
+            return True
         
-        # Add to data
-        data['sessions'].append(new_session)
+        # Only newline-terminated records are complete; skip torn records and
+        # sessions already merged by a compaction that was interrupted before
+        # removing the log
+        known_ids = {session.get('id') for session in data['sessions']}
+        for line in lines[:-1]:
+            if line:
+                try:
+                    session = dwt_json.loads(line)
+                except ValueError:
+                    continue
+                if session.get('id') not in known_ids:
+                    data['sessions'].append(session)
         data['totalSessions'] = len(data['sessions'])
-        data['extracted'] = datetime.now().isoformat() + "Z"
+        data['extracted'] = datetime.now().strftime(TIMESTAMP_FORMAT)
         
-        # Save updated data
+        # Save updated data, replacing the old file atomically
         try:
-            with open(data_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            print(f"\r\033[K📝 Session logged: {duration_minutes} minutes")
+            _atomic_write_json(DATA_FILE, data, indent=2)
+            LOG_FILE.unlink()
+            self.save_meta({"totalSessions": data['totalSessions'], "extracted": data['extracted']})
             return True
             
-        except Exception as e:
-            print(f"❌ Error saving session data: {e}")
+        except OSError as e:
+            print(f"❌ Error compacting session data: {e}")
             return False
     
+    def update_meta(self, new_sessions):
+        """Keep totalSessions and extracted current in a small sidecar file"""
+        try:
+            meta = dwt_json.loads(META_FILE.read_bytes())
+            meta['totalSessions'] += new_sessions
+        except (OSError, ValueError, KeyError):
+            # No usable sidecar yet: count the sessions once
+            meta = {"totalSessions": self.count_sessions()}
+        meta['extracted'] = datetime.now().strftime(TIMESTAMP_FORMAT)
+        self.save_meta(meta)
+    
+    def save_meta(self, meta):
+        """Replace the sidecar file, without fsync since it's rebuilt when missing"""
+        tmp_path = META_FILE.with_name(META_FILE.name + '.tmp')
+        try:
+            tmp_path.write_bytes(dwt_json.dumps(meta))
+            os.replace(tmp_path, META_FILE)
+        except OSError:
+            pass  # The sidecar is only a convenience
+    
+    def count_sessions(self):
+        """Count the sessions in the data file and the session log"""
+        try:
+            sessions = dwt_json.loads(DATA_FILE.read_bytes())['sessions']
+            known_ids, total = {session.get('id') for session in sessions}, len(sessions)
+        except (OSError, ValueError, KeyError):
+            known_ids, total = set(), 0
+        try:
+            lines = LOG_FILE.read_bytes().split(b'\n')
+        except OSError:
+            return total
+        # Same rules as compaction: complete, decodable records not already merged
+        for line in lines[:-1]:
+            try:
+                if line and dwt_json.loads(line).get('id') not in known_ids:
+                    total += 1
+            except ValueError:
+                pass
+        return total
+    
+    def remaining_seconds(self, state):
+        """Seconds left in a session, frozen at paused_at while paused"""
+        now = state.get('paused_at') or time.time()
+        return state['duration'] - (now - state['start_time'] - state['paused_duration'])
+    
     def format_time(self, seconds):
         """Format seconds into MM:SS"""
         mins = int(seconds // 60)
         secs = int(seconds % 60)
         return f"{mins:02d}:{secs:02d}"
     
-    def check_keyboard_input(self):
-        """Check for non-blocking keyboard input"""
+    def check_keyboard_input(self, timeout=0):
+        """Wait up to timeout seconds for a key press (the caller puts the terminal in raw mode)"""
         try:
-            # Check if input is available without blocking
-            if select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], []):
-                # Save terminal settings
-                old_settings = termios.tcgetattr(sys.stdin)
-                try:
-                    # Set terminal to raw mode for single character input
-                    tty.setraw(sys.stdin.fileno())
-                    char = sys.stdin.read(1)
-                    return char.lower()
-                finally:
-                    # Restore terminal settings
-                    termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+            if select.select([sys.stdin], [], [], timeout)[0]:
+                # Read the fd directly: sys.stdin's buffer could hold keys select() can't see
+                return os.read(sys.stdin.fileno(), 1).decode('latin-1').lower()
             return None
-        except:
+        except (OSError, termios.error):
             return None
     
     def show_countdown(self, total_seconds, start_time, paused_duration=0):
         """Display countdown timer with interactive controls"""
+        # The countdown never writes to disk: start_time, duration and
+        # paused_duration don't change while running, so the state saved
+        # before entering is enough to recover the remaining time.
         print("💡 Controls: [s]top, [q]uit, or Ctrl+C")
         print()
-        import termios
-        import tty
+        # Raw mode for single key presses, set once for the whole countdown
         old_settings = termios.tcgetattr(sys.stdin)
+        # Anchor the saved wall-clock times to the monotonic clock once, so
+        # clock changes (NTP, DST, manual) can't skew the countdown. Cap it at
+        # the session length in case the clock was set back since the start
+        remaining = min(total_seconds, total_seconds - (time.time() - start_time - paused_duration))
+        deadline_ns = time.monotonic_ns() + int(remaining * 1_000_000_000)
+        total_ns = int(total_seconds * 1_000_000_000)
+        last_frame = None
+        # Frames bypass sys.stdout with one write each, so flush what's buffered first
+        sys.stdout.flush()
+        stdout_fd = sys.stdout.fileno()
         try:
             tty.setraw(sys.stdin.fileno())
+            # Drop keys typed before the countdown so they can't trigger stop/quit
+            termios.tcflush(sys.stdin, termios.TCIFLUSH)
             while True:
-                elapsed = time.time() - start_time - paused_duration
-                remaining = max(0, total_seconds - elapsed)
-                if remaining <= 0:
-                    print(f"\r\033[KGreat job!")
-                    print()
-                    # Play notification sound
-                    try:
-                        subprocess.run(['afplay', '/System/Library/Sounds/Glass.aiff'], 
-                                     capture_output=True, timeout=2)
-                    except:
-                        print('\a')  # Fallback beep
-                    return True
-
-                # Display countdown
-                time_str = self.format_time(remaining)
-                progress = (total_seconds - remaining) / total_seconds
-                bar_length = 30
-                filled = int(bar_length * progress)
-                bar = '█' * filled + '░' * (bar_length - filled)
+                remaining_ns = deadline_ns - time.monotonic_ns()
+                remaining = max(0, remaining_ns / 1_000_000_000)
+                if remaining_ns <= 0:
+                    os.write(stdout_fd, DONE_MESSAGE)
+                    # Play notification sound in the background
+                    self.play_notification_sound()
+                    return Action.COMPLETED
 
-                print(f"\r⏱️  {time_str} │{bar}│ [s]top [q]uit: ", end='', flush=True)
+                # Display countdown, only when something visible changed
+                mins, secs = divmod(remaining_ns // 1_000_000_000, 60)
+                filled = (total_ns - remaining_ns) * BAR_LENGTH // total_ns
+                frame = (filled, mins, secs)
+                if frame != last_frame:
+                    last_frame = frame
+                    os.write(stdout_fd, FRAME_FORMAT % (mins, secs, PROGRESS_BARS[filled]))
 
-                # Check for keyboard input
-                import select
-                if select.select([sys.stdin], [], [], 0)[0]:
-                    char = sys.stdin.read(1).lower()
-                    if char == 's':
-                        print('\r\033[K', end='')  # Clear the timer line
-                        print("⏸️  Session paused.")  # Print the pause message
-                        print('\r\033[K')  # Clear the next line and move the cursor to the left
-                        self.run_shortcut("stop deep")
-                        sys.exit(1)
-                    elif char == 'q':
-                        return self.handle_quit_during_countdown(remaining, start_time, paused_duration)
-
-                time.sleep(0.1)
+                # Sleep until a key is pressed or the display changes on the next second
+                char = self.check_keyboard_input((remaining_ns % 1_000_000_000) / 1_000_000_000 or 1.0)
+                if char == 's':
+                    os.write(stdout_fd, PAUSED_MESSAGE)
+                    self.run_shortcut("stop deep", wait=False)
+                    sys.exit(1)
+                elif char == 'q':
+                    return self.handle_quit_during_countdown(remaining, start_time, paused_duration)
         except KeyboardInterrupt:
             print(f"\n⏸️  Session paused at {self.format_time(remaining)}")
-            self.run_shortcut("stop deep")
-            return False
+            self.run_shortcut("stop deep", wait=False)
+            return Action.PAUSED
         finally:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
     
-    def handle_stop_during_countdown(self, remaining):
-        """Handle stop command during countdown"""
-        print("\n⏸️  Session paused.")
-        self.run_shortcut("stop deep")
-        return False
-    
     def handle_quit_during_countdown(self, remaining, start_time, paused_duration):
         """Handle quit command during countdown"""
         # Quit session without logging anything
         
         # Run stop shortcut
-        self.run_shortcut("stop deep")
+        self.run_shortcut("stop deep", wait=False)
         
         self.clear_state()
         print(f"\r\033[K🚪 Session quit. No time logged.")
         print('\r\033[K', end='')  # Clear the line again and leave cursor at start
-        return "ended"
+        return Action.ENDED
+    
+    def run_countdown(self):
+        """Run the countdown for the current session, then log it or record the pause"""
+        state = self.state
+        result = self.show_countdown(state['duration'], state['start_time'], state['paused_duration'])
+        self._finalize(result)
+    
+    def _finalize(self, result):
+        """Handle how a countdown ended"""
+        state = self.state
+        if result is Action.COMPLETED:
+            # Session completed successfully
+            # The session ended at its deadline, even if this runs later
+            actual_start = datetime.fromtimestamp(state['start_time'])
+            end_time = actual_start + timedelta(seconds=state['paused_duration'] + state['duration'])
+            
+            # Run stop shortcut in the background
+            self.run_shortcut("stop deep", wait=False)
+            
+            self._commit_session(actual_start, end_time, 60)  # 60 minutes
+            print("🎉 Session completed successfully!")
+        elif result is Action.ENDED:
+            # Session was ended during countdown (already handled in method)
+            pass
+        else:
+            # Session was paused
+            state['paused_at'] = time.time()
+            self.save_state()
+            print("Session paused. Use 'continue' to resume.")
+            sys.exit(1)
+    
+    def _commit_session(self, start_time, end_time, duration_minutes):
+        """Log a completed session and drop its state as one durable step"""
+        # The log append is fsynced, so only the state unlink is left to persist
+        self.add_session_to_data(start_time, end_time, duration_minutes)
+        self.clear_state()
+        try:
+            _fsync_dir(STATE_FILE)
+        except OSError:
+            pass
     
     def start_session(self):
         """Start a new deep work session"""
@@ -291,14 +482,13 @@ class DeepWorkTimer:
         session_duration = 3600  # 1 hour in seconds
         
         # Save initial state
-        state = {
+        self.save_state({
             'active': True,
             'start_time': start_time,
             'duration': session_duration,
             'paused_duration': 0,
             'paused_at': None
-        }
-        self.save_state(state)
+        })
         
         print(f"🚀 Deep work session started!")
         print(f"📅 Start time: {datetime.now().strftime('%H:%M:%S')}")
@@ -306,35 +496,7 @@ class DeepWorkTimer:
         print()
         
         # Show countdown
-        result = self.show_countdown(session_duration, start_time)
-        
-        if result == True:
-            # Session completed successfully
-            end_time = datetime.now()
-            actual_start = datetime.fromtimestamp(start_time)
-            
-            # Run stop shortcut
-            self.run_shortcut("stop deep")
-            
-            # Log the session
-            self.add_session_to_data(actual_start, end_time, 60)  # 60 minutes
-            
-            self.clear_state()
-            print("🎉 Session completed successfully!")
-        elif result == "ended":
-            # Session was ended during countdown (already handled in method)
-            pass
-        elif result == "continue":
-            # User chose to continue, restart countdown loop
-            self.start_session()
-        else:
-            # Session was paused
-            remaining = session_duration - (time.time() - start_time - state['paused_duration'])
-            state['paused_at'] = time.time()
-            state['remaining'] = remaining
-            self.save_state(state)
-            print("Session paused. Use 'continue' to resume.")
-            sys.exit(1)
+        self.run_countdown()
     
     def continue_session(self):
         """Continue a paused session or resume the timer UI if already running"""
@@ -345,80 +507,27 @@ class DeepWorkTimer:
         if not self.state.get('paused_at'):
             # Session is running, resume the timer UI
             print("▶️  Resuming active session...")
-            self.run_shortcut("start deep")  # Call the shortcut when continuing
-            remaining = self.state['duration'] - (time.time() - self.state['start_time'] - self.state['paused_duration'])
-            print(f"⏰ Remaining time: {self.format_time(remaining)}")
+            self.run_shortcut("start deep", wait=False)  # Call the shortcut when continuing
+            print(f"⏰ Remaining time: {self.format_time(self.remaining_seconds(self.state))}")
             print()
-            result = self.show_countdown(self.state['duration'], self.state['start_time'], self.state['paused_duration'])
-            if result == True:
-                # Session completed successfully
-                end_time = datetime.now()
-                actual_start = datetime.fromtimestamp(self.state['start_time'])
-                self.run_shortcut("stop deep")
-                self.add_session_to_data(actual_start, end_time, 60)  # 60 minutes
-                self.clear_state()
-                print("🎉 Session completed successfully!")
-            elif result == "ended":
-                pass
-            elif result == "continue":
-                self.continue_session()
-            else:
-                new_remaining = self.state['duration'] - (time.time() - self.state['start_time'] - self.state['paused_duration'])
-                self.state['paused_at'] = time.time()
-                self.state['remaining'] = new_remaining
-                self.save_state(self.state)
-            sys.exit(0)
+            self.run_countdown()
         else:
             # Session is paused, continue as before
             print("▶️  Continuing deep work session...")
             
             # Run start shortcut when continuing
-
-
-            self.run_shortcut("start deep")
-            
-            # Calculate paused duration
-            pause_duration = time.time() - self.state['paused_at']
-            total_paused = self.state['paused_duration'] + pause_duration
+            self.run_shortcut("start deep", wait=False)
             
-            # Update state
-            state = self.state.copy()
-            state['paused_duration'] = total_paused
-            state['paused_at'] = None
-            self.save_state(state)
+            # Add this pause to the paused duration and save
+            self.state['paused_duration'] += time.time() - self.state['paused_at']
+            self.state['paused_at'] = None
+            self.save_state()
             
-            remaining = state.get('remaining', state['duration'])
-            print(f"⏰ Remaining time: {self.format_time(remaining)}")
+            print(f"⏰ Remaining time: {self.format_time(self.remaining_seconds(self.state))}")
             print()
             
             # Continue countdown
-            result = self.show_countdown(state['duration'], state['start_time'], total_paused)
-            
-            if result == True:
-                # Session completed successfully
-                end_time = datetime.now()
-                actual_start = datetime.fromtimestamp(state['start_time'])
-                
-                # Run stop shortcut
-                self.run_shortcut("stop deep")
-                
-                # Log the session
-                self.add_session_to_data(actual_start, end_time, 60)  # 60 minutes
-                
-                self.clear_state()
-                print("🎉 Session completed successfully!")
-            elif result == "ended":
-                # Session was ended during countdown (already handled in method)
-                pass
-            elif result == "continue":
-                # User chose to continue, restart countdown loop
-                self.continue_session()
-            else:
-                # Session was paused again
-                new_remaining = state['duration'] - (time.time() - state['start_time'] - total_paused)
-                state['paused_at'] = time.time()
-                state['remaining'] = new_remaining
-                self.save_state(state)
+            self.run_countdown()
     
     def stop_session(self):
         """Stop/pause the current session"""
@@ -428,15 +537,12 @@ class DeepWorkTimer:
 
         # Immediately pause session and call shortcut
         if not self.state.get('paused_at'):
-            state = self.state.copy()
-            state['paused_at'] = time.time()
-            remaining = state['duration'] - (time.time() - state['start_time'] - state['paused_duration'])
-            state['remaining'] = remaining
-            self.save_state(state)
+            self.state['paused_at'] = time.time()
+            self.save_state()
             print('\r\033[K', end='')  # Clear the timer line
             print("⏸️  Session paused.")
             print('\r\033[K')  # Clear the next line and move the cursor to the left
-            self.run_shortcut("stop deep")
+            self.run_shortcut("stop deep", wait=False)
             sys.exit(1)
         else:
             print("ℹ️  Session is already paused.")
@@ -449,13 +555,11 @@ class DeepWorkTimer:
             return
         
         start_time = datetime.fromtimestamp(self.state['start_time'])
-        duration = self.state['duration']
-        paused_duration = self.state['paused_duration']
+        remaining = max(0, self.remaining_seconds(self.state))
         
         if self.state.get('paused_at'):
             # Session is paused
             paused_since = datetime.fromtimestamp(self.state['paused_at'])
-            remaining = self.state.get('remaining', duration)
             print(f"⏸️  Session PAUSED")
             print(f"📅 Started: {start_time.strftime('%H:%M:%S')}")
             print(f"⏸️  Paused at: {paused_since.strftime('%H:%M:%S')}")
@@ -463,8 +567,6 @@ class DeepWorkTimer:
             print(f"💡 Use 'continue' to resume")
         else:
             # Session is running
-            elapsed = time.time() - self.state['start_time'] - paused_duration
-            remaining = max(0, duration - elapsed)
             print(f"🟢 Session ACTIVE")
             print(f"📅 Started: {start_time.strftime('%H:%M:%S')}")
             print(f"⏰ Time remaining: {self.format_time(remaining)}")